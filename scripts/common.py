@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
-"""Shared severity model, JSON report schema, and path helpers for anvil validators."""
+"""Shared severity model, JSON report schema, path and frontmatter helpers for anvil validators."""
 
 from __future__ import annotations
 
 import json
+import subprocess
 import sys
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 
 ANVIL_VERSION = "0.1.0"
+EXTERNAL_TIMEOUT = 30
 
 
 @dataclass
@@ -23,6 +25,7 @@ class Finding:
 class Report:
     plugin_path: str
     findings: list[Finding] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)  # rule name -> seconds (run_checks only)
 
     def add(self, check_id: str, severity: str, message: str, **sources: str) -> None:
         self.findings.append(Finding(check_id, severity, message, sources))
@@ -47,15 +50,21 @@ class Report:
     def has_errors(self) -> bool:
         return any(f.severity == "ERROR" for f in self.findings)
 
-    def to_json(self) -> str:
-        return json.dumps({
+    def to_dict(self) -> dict:
+        data = {
             "tool": "anvil",
             "version": ANVIL_VERSION,
             "plugin_path": self.plugin_path,
             "findings": [asdict(f) for f in self.findings],
             "summary": self.summary,
             "exit_code": 1 if self.has_errors else 0,
-        }, indent=2)
+        }
+        if self.timings:
+            data["timings"] = {k: round(v, 4) for k, v in self.timings.items()}
+        return data
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
 
     def print_human(self) -> None:
         if not self.findings:
@@ -90,6 +99,16 @@ def resolve_plugin_path(argv: list[str] | None = None) -> Path:
     return Path.cwd().resolve()
 
 
+def run_external(argv: list[str], cwd: Path | None = None,
+                 timeout: float = EXTERNAL_TIMEOUT) -> subprocess.CompletedProcess | subprocess.TimeoutExpired | OSError:
+    """Run an external check, returning the failure instead of raising it."""
+    try:
+        return subprocess.run(argv, capture_output=True, text=True, timeout=timeout,
+                              cwd=str(cwd) if cwd else None)
+    except (subprocess.TimeoutExpired, OSError) as e:
+        return e
+
+
 def load_json_file(path: Path) -> dict | list | None:
     """Load JSON file, return None if missing or malformed."""
     if not path.exists():
@@ -98,3 +117,28 @@ def load_json_file(path: Path) -> dict | list | None:
         return json.loads(path.read_text(encoding="utf-8"))
     except json.JSONDecodeError:
         return None
+
+
+def extract_frontmatter_field(content: str, field: str) -> str:
+    """Extract a field value from YAML frontmatter (simple parser)."""
+    if not content.startswith("---"):
+        return ""
+    end = content.find("---", 3)
+    if end == -1:
+        return ""
+    fm = content[3:end]
+    for line in fm.split("\n"):
+        if line.strip().startswith(f"{field}:"):
+            value = line.split(":", 1)[1].strip()
+            if value == "|" or value == ">":
+                # Multi-line value: collect indented lines
+                lines = []
+                idx = fm.find(line) + len(line) + 1
+                for sub_line in fm[idx:].split("\n"):
+                    if sub_line and (sub_line[0] == " " or sub_line[0] == "\t"):
+                        lines.append(sub_line.strip())
+                    else:
+                        break
+                return " ".join(lines)
+            return value.strip('"').strip("'")
+    return ""
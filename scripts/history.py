@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Query the run history recorded by `run_checks.py --store`."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from contextlib import closing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import store
+from rules import parse_patterns
+
+DEFAULT_STORE = "anvil.db"
+
+
+def _table(rows: list[dict], columns: tuple[str, ...]) -> None:
+    if not rows:
+        print("  (nothing recorded)")
+        return
+    cells = [[_cell(r.get(c)) for c in columns] for r in rows]
+    widths = [max(len(c), *(len(row[i]) for row in cells)) for i, c in enumerate(columns)]
+    print("  " + "  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row in cells:
+        print("  " + "  ".join(v.ljust(w) for v, w in zip(row, widths)))
+
+
+def _cell(value: object) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+def _selection(args) -> str | None:
+    """Runs to compare: the same --only/--skip key (full runs by default), or all with --all-runs."""
+    if args.all_runs:
+        return None
+    return store.selection_key(parse_patterns(args.only), parse_patterns(args.skip))
+
+
+def cmd_trends(conn, args) -> object:
+    selection = _selection(args)
+    return {
+        "runs": store.trends(conn, args.plugin, args.limit, selection),
+        "slower": store.slowdowns(conn, args.plugin, args.window, selection=selection),
+    }
+
+
+def cmd_diff(conn, args) -> object:
+    if args.runs:
+        old, new = args.runs
+    else:
+        pair = store.last_two_runs(conn, args.plugin, _selection(args))
+        if pair is None:
+            raise SystemExit(f"Need at least two recorded runs of '{args.plugin}' with the same selection")
+        old, new = pair
+    selections = store.run_selections(conn, old, new)
+    missing = [str(i) for i in (old, new) if i not in selections]
+    if missing:
+        raise SystemExit(f"No recorded run with id {' and '.join(missing)}")
+    return {"old_run": old, "new_run": new, "same_selection": selections.get(old) == selections.get(new),
+            **store.diff_runs(conn, old, new)}
+
+
+def cmd_first_seen(conn, args) -> object:
+    return store.first_seen(conn, args.check_id, args.plugin)
+
+
+def cmd_slowest(conn, args) -> object:
+    return store.slowest(conn, args.by, args.since, args.limit, _selection(args))
+
+
+def print_human(command: str, result) -> None:
+    if command == "trends":
+        print("Recent runs:")
+        _table(result["runs"], ("id", "started_at", "plugin", "plugin_version", "duration",
+                                "errors", "warns", "infos", "selection"))
+        if result["slower"]:
+            print("\nSlower than the previous window:")
+            _table(result["slower"], ("plugin", "previous_seconds", "recent_seconds"))
+    elif command == "diff":
+        print(f"Run {result['old_run']} -> {result['new_run']}")
+        if not result["same_selection"]:
+            print("  (runs used different --only/--skip selections; unselected checks show as new/resolved)")
+        for key in ("new", "resolved"):
+            print(f"\n{key.capitalize()} ({len(result[key])}):")
+            for f in result[key]:
+                print(f"  {f['severity']:<5} {f['check_id']}  {f['message']}")
+    elif command == "first-seen":
+        _table(result, ("plugin", "first_seen", "last_seen", "runs"))
+    else:
+        _table(result, ("name", "runs", "avg_seconds", "max_seconds"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--store", type=Path, default=Path(DEFAULT_STORE),
+                        help=f"SQLite database written by run_checks.py --store (default: {DEFAULT_STORE})")
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--json", action="store_true")
+    select = argparse.ArgumentParser(add_help=False)
+    select.add_argument("--only", help="compare runs recorded with this --only (default: full runs)")
+    select.add_argument("--skip", help="compare runs recorded with this --skip")
+    select.add_argument("--all-runs", action="store_true", help="include runs with any selection")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("trends", parents=[output, select], help="recent runs and plugins that got slower")
+    p.add_argument("--plugin")
+    p.add_argument("--limit", type=int, default=20)
+    p.add_argument("--window", type=int, default=5, help="runs per comparison window (default: 5)")
+    p.set_defaults(handler=cmd_trends)
+
+    p = sub.add_parser("diff", parents=[output, select], help="findings new or resolved between two runs")
+    group = p.add_mutually_exclusive_group(required=True)
+    group.add_argument("--plugin", help="compare the last two runs of this plugin")
+    group.add_argument("--runs", type=int, nargs=2, metavar=("OLD", "NEW"))
+    p.set_defaults(handler=cmd_diff)
+
+    p = sub.add_parser("first-seen", parents=[output], help="when a check id first appeared, per plugin")
+    p.add_argument("check_id")
+    p.add_argument("--plugin")
+    p.set_defaults(handler=cmd_first_seen)
+
+    p = sub.add_parser("slowest", parents=[output, select], help="average time per validator, rule or plugin")
+    p.add_argument("--by", choices=("validator", "rule", "plugin"), default="validator")
+    p.add_argument("--since", help="ISO date or timestamp, e.g. 2026-10-01")
+    p.add_argument("--limit", type=int, default=10)
+    p.set_defaults(handler=cmd_slowest)
+
+    args = parser.parse_args()
+    if not args.store.exists():
+        print(f"No history at {args.store}; record runs with run_checks.py --store {args.store}",
+              file=sys.stderr)
+        return 1
+    with closing(store.connect(args.store)) as conn:
+        result = args.handler(conn, args)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_human(args.command, result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
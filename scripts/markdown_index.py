@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Single-pass Markdown index (frontmatter, headings, fenced blocks), cached per file.
+
+README and command checks query the same parsed document instead of each
+splitting, lowercasing or regex-scanning the full text again, and every
+match carries its 1-based line number for findings.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+HEADING_RE = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+# Any indentation, so fences nested under list items count, as they always have here.
+FENCE_RE = re.compile(r"^[ \t]*(`{3,}|~{3,})[ \t]*([^`\s]*)")
+
+
+@dataclass(frozen=True)
+class Heading:
+    level: int
+    text: str
+    line: int
+    end: int  # last line of the section, before the next heading of the same or higher level
+
+
+@dataclass(frozen=True)
+class CodeBlock:
+    lang: str
+    start: int  # opening fence line
+    end: int  # closing fence line (last line of the file if unclosed)
+    text: str
+
+
+@dataclass
+class MarkdownDoc:
+    path: Path
+    text: str
+    lines: list[str]
+    frontmatter_end: int = 0  # closing `---` line, 0 without frontmatter (or when not requested)
+    headings: list[Heading] = field(default_factory=list)
+    blocks: list[CodeBlock] = field(default_factory=list)
+    in_code: list[bool] = field(default_factory=list)  # per line, fence lines included
+
+    def lines_where(self, code: bool | None = None) -> Iterator[tuple[int, str]]:
+        """(line number, text) for all lines, only code-block lines, or only prose lines."""
+        for i, line in enumerate(self.lines):
+            if code is None or self.in_code[i] == code:
+                yield i + 1, line
+
+    def find(self, needle: str, code: bool | None = None) -> int | None:
+        """Line number of the first line containing `needle`."""
+        for lineno, line in self.lines_where(code):
+            if needle in line:
+                return lineno
+        return None
+
+    def search(self, pattern: re.Pattern, code: bool | None = None) -> tuple[int, re.Match] | None:
+        """Line number and match of the first line matching `pattern`."""
+        for lineno, line in self.lines_where(code):
+            m = pattern.search(line)
+            if m:
+                return lineno, m
+        return None
+
+    def section(self, pattern: re.Pattern, level: int | None = None) -> Heading | None:
+        """First heading (optionally of one level) whose text matches `pattern`."""
+        for h in self.headings:
+            if (level is None or h.level == level) and pattern.search(h.text):
+                return h
+        return None
+
+
+def parse(path: Path, text: str, frontmatter: bool = False) -> MarkdownDoc:
+    """Index `text`; with `frontmatter`, a leading `---` block is YAML rather than Markdown.
+
+    Only commands, skills and agents have frontmatter. In a README a leading `---` is a
+    thematic break, so it is never treated as frontmatter there.
+    """
+    lines = text.split("\n")
+    doc = MarkdownDoc(path, text, lines, in_code=[False] * len(lines))
+
+    start = 0
+    if frontmatter and lines and lines[0].rstrip() == "---":
+        for i in range(1, len(lines)):
+            if lines[i].rstrip() == "---":
+                doc.frontmatter_end = start = i + 1
+                break
+
+    raw_headings: list[tuple[int, str, int]] = []
+    open_fence: tuple[str, str, int] | None = None  # (marker, lang, line index)
+    for i in range(start, len(lines)):
+        line = lines[i]
+        if open_fence is not None:
+            doc.in_code[i] = True
+            marker, lang, begin = open_fence
+            stripped = line.strip()
+            if stripped.startswith(marker) and stripped == stripped[0] * len(stripped):
+                doc.blocks.append(CodeBlock(lang, begin + 1, i + 1, "\n".join(lines[begin + 1:i])))
+                open_fence = None
+            continue
+        fence = FENCE_RE.match(line)
+        if fence:
+            doc.in_code[i] = True
+            open_fence = (fence.group(1), fence.group(2), i)
+            continue
+        m = HEADING_RE.match(line)
+        if m:
+            raw_headings.append((len(m.group(1)), (m.group(2) or "").strip(), i + 1))
+    if open_fence is not None:
+        _, lang, begin = open_fence
+        doc.blocks.append(CodeBlock(lang, begin + 1, len(lines), "\n".join(lines[begin + 1:])))
+
+    # A section ends where the next heading of the same or higher level starts.
+    ends = [len(lines)] * len(raw_headings)
+    open_sections: list[int] = []
+    for n, (level, _, lineno) in enumerate(raw_headings):
+        while open_sections and raw_headings[open_sections[-1]][0] >= level:
+            ends[open_sections.pop()] = lineno - 1
+        open_sections.append(n)
+    doc.headings = [Heading(level, text, lineno, end) for (level, text, lineno), end in zip(raw_headings, ends)]
+    return doc
+
+
+_cache: dict[tuple[Path, bool], tuple[tuple[int, int], MarkdownDoc]] = {}
+_lock = threading.Lock()
+
+
+def load_markdown(path: Path, frontmatter: bool = False) -> MarkdownDoc | None:
+    """Parsed document for `path`, reused while its mtime and size are unchanged; None if unreadable."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = (path.resolve(), frontmatter)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        text = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    doc = parse(path, text, frontmatter)
+    with _lock:
+        _cache[key] = (stamp, doc)
+    return doc
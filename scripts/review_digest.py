@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Collect the facts behind the anvil-reviewer checklist into one compact JSON digest."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import Report, resolve_plugin_path, load_json_file, extract_frontmatter_field
+from markdown_index import MarkdownDoc, load_markdown
+import validate_conventions
+import validate_hooks
+import validate_schema
+import validate_structure
+
+VALIDATORS = (validate_schema, validate_structure, validate_hooks, validate_conventions)
+# Checklist rules, looser than validate_schema: pre-release/build suffixes (item 2), and
+# CHANGELOG headings with or without brackets (items 4, 8).
+CHECKLIST_SEMVER_RE = re.compile(r"^\d+\.\d+\.\d+(?:-[0-9A-Za-z.-]+)?(?:\+[0-9A-Za-z.-]+)?$")
+CHANGELOG_HEADING_RE = re.compile(r"(?m)^##\s+\[?v?(\d+\.\d+\.\d+(?:-[0-9A-Za-z.-]+)?(?:\+[0-9A-Za-z.-]+)?)\]?")
+XML_TAG_RE = re.compile(r"</?[A-Za-z][\w-]*\s*/?>")
+CONVENTIONAL_RE = re.compile(r"^(feat|fix|docs|chore|refactor|test|style|ci|perf)(\([^)]*\))?!?: \S")
+ABS_PATH_RE = re.compile(r"/Users/|/home/|/root/")
+SECRET_RE = re.compile(r"api_key|secret|password|token|Bearer |sk-|ghp_|-----BEGIN", re.IGNORECASE)
+STDIN_RE = re.compile(r"\$\(cat\)|\bread\b|sys\.stdin|process\.stdin|/dev/stdin")
+JSON_PARSER_RE = re.compile(r"\bjq\b|json\.loads?\(|JSON\.parse")
+RAW_PARSE_RE = re.compile(r"\b(cut|awk)\b|grep\s+-o")
+MAX_MATCHES = 20
+MAX_SCAN_BYTES = 1_000_000
+
+
+def _read(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return ""
+
+
+def _frontmatter(content: str, fields: tuple[str, ...]) -> dict:
+    return {f: extract_frontmatter_field(content, f) for f in fields}
+
+
+def _readme_outline(doc: MarkdownDoc) -> list[dict]:
+    """Headings outside fenced blocks, with line numbers and prose word counts up to the next heading."""
+    bounds = [h.line for h in doc.headings[1:]] + [len(doc.lines) + 1]
+    return [
+        {"level": h.level, "title": h.text, "line": h.line,
+         "words": sum(len(doc.lines[i].split()) for i in range(h.line, nxt - 1) if not doc.in_code[i])}
+        for h, nxt in zip(doc.headings, bounds)
+    ]
+
+
+def _manifest(plugin_path: Path) -> dict:
+    pj = load_json_file(plugin_path / ".claude-plugin" / "plugin.json")
+    if not isinstance(pj, dict):
+        return {"present": False}
+    version = pj.get("version")
+    declared = {}
+    for key in validate_structure.COMPONENT_DIRS:
+        value = pj.get(key)
+        paths = [value] if isinstance(value, str) else value if isinstance(value, list) else []
+        declared.update({p: (plugin_path / p).exists() for p in paths if isinstance(p, str)})
+    return {
+        "present": True,
+        "fields": pj,
+        "missing_fields": [f for f in validate_schema.REQUIRED_FIELDS if not pj.get(f)],
+        "semver": isinstance(version, str) and bool(CHECKLIST_SEMVER_RE.match(version)),
+        "name_matches_dir": pj.get("name") == plugin_path.name,
+        "declared_paths": declared,
+    }
+
+
+def _changelog(plugin_path: Path, version: object) -> dict:
+    path = plugin_path / "CHANGELOG.md"
+    if not path.exists():
+        return {"present": False}
+    versions = CHANGELOG_HEADING_RE.findall(_read(path))
+    return {
+        "present": True,
+        "head_version": versions[0] if versions else None,
+        "versions": versions[:MAX_MATCHES],
+        "has_current_version": isinstance(version, str) and version in versions,
+    }
+
+
+def _readme(plugin_path: Path) -> dict:
+    doc = load_markdown(plugin_path / "README.md")
+    if doc is None:
+        return {"present": False}
+    text = doc.text
+    install_lines = [{"line": i, "text": line.strip()} for i, line in doc.lines_where()
+                     if "claude plugin" in line][:MAX_MATCHES]
+    return {
+        "present": True,
+        "bytes": len(text.encode("utf-8")),
+        "outline": _readme_outline(doc),
+        "install_lines": install_lines,
+        "install_markers": "<!-- INSTALL:START" in text and "<!-- INSTALL:END -->" in text,
+        "mentions_reporter": "reporter@emporium" in text,
+    }
+
+
+def _documents(plugin_path: Path) -> dict:
+    def describe(path: Path, fields: tuple[str, ...]) -> dict:
+        content = _read(path)
+        fm = _frontmatter(content, fields)
+        desc = fm.get("description", "")
+        return {
+            "file": str(path.relative_to(plugin_path)),
+            "frontmatter": fm,
+            "description_chars": len(desc),
+            "first_person": bool(validate_conventions.FIRST_PERSON_RE.search(desc)),
+            "xml_tags": bool(XML_TAG_RE.search(desc)),
+            "lines": content.count("\n") + 1,
+            "plugin_root_injections": content.count("@${CLAUDE_PLUGIN_ROOT}/"),
+        }
+
+    commands = sorted(p for p in (plugin_path / "commands").rglob("*") if p.is_file()) \
+        if (plugin_path / "commands").is_dir() else []
+    skills = sorted((plugin_path / "skills").glob("*/SKILL.md"))
+    agents = sorted((plugin_path / "agents").glob("*.md"))
+    return {
+        "commands": [describe(p, ("description", "allowed-tools")) for p in commands],
+        "skills": [describe(p, ("name", "description")) for p in skills],
+        "agents": [describe(p, ("name", "description", "model", "tools", "maxTurns")) for p in agents],
+        "has_lib_prompts": (plugin_path / "lib" / "prompts").is_dir(),
+    }
+
+
+def _hooks(plugin_path: Path) -> dict:
+    data = load_json_file(plugin_path / "hooks" / "hooks.json")
+    if not isinstance(data, dict):
+        return {"present": (plugin_path / "hooks").is_dir(), "hooks_json": False}
+    normalized = validate_hooks.normalize_hooks(data.get("hooks", [])) or []
+    scripts: dict[str, dict] = {}
+    for event, hook in normalized:
+        for sub_hook in hook.get("hooks", []):
+            rel = validate_hooks.script_for_command(sub_hook.get("command", ""))
+            if not rel or rel in scripts:
+                continue
+            path = plugin_path / rel
+            content = _read(path) if path.is_file() else ""
+            scripts[rel] = {
+                "event": event,
+                "exists": path.is_file(),
+                "executable": path.is_file() and os.access(path, os.X_OK),
+                "reads_stdin": bool(STDIN_RE.search(content)),
+                "json_parser": bool(JSON_PARSER_RE.search(content)),
+                "raw_parsing": bool(RAW_PARSE_RE.search(content)),
+                "dangerous": [desc for pattern, desc in validate_hooks.DANGEROUS_PATTERNS
+                              if pattern.search(content)],
+            }
+    return {
+        "present": True,
+        "hooks_json": True,
+        "events": sorted({event for event, _ in normalized}),
+        "scripts": scripts,
+    }
+
+
+def _scan(plugin_path: Path) -> dict:
+    """Line-level matches for absolute paths and secret-like tokens, capped per category."""
+    hits: dict[str, list[str]] = {"absolute_paths": [], "secrets": []}
+    for f in sorted(plugin_path.rglob("*")):
+        if not f.is_file() or ".git" in f.parts or "__pycache__" in f.parts:
+            continue
+        if f.stat().st_size > MAX_SCAN_BYTES:
+            continue
+        content = _read(f)
+        if "\0" in content:
+            continue
+        rel = str(f.relative_to(plugin_path))
+        for lineno, line in enumerate(content.split("\n"), 1):
+            for key, pattern in (("absolute_paths", ABS_PATH_RE), ("secrets", SECRET_RE)):
+                if len(hits[key]) < MAX_MATCHES and pattern.search(line):
+                    hits[key].append(f"{rel}:{lineno}: {line.strip()[:120]}")
+    return hits
+
+
+def _git(plugin_path: Path) -> dict:
+    if not (plugin_path / ".git").exists():
+        return {"repo": False}
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(plugin_path), "log", "--format=%s", "-20"],
+            capture_output=True, text=True, timeout=10,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return {"repo": True, "subjects": []}
+    subjects = result.stdout.splitlines()
+    return {
+        "repo": True,
+        "subjects": subjects,
+        "non_conventional": [s for s in subjects if not CONVENTIONAL_RE.match(s)],
+    }
+
+
+def build_digest(plugin_path: Path) -> dict:
+    manifest = _manifest(plugin_path)
+    marketplace = load_json_file(plugin_path / ".claude-plugin" / "marketplace.json")
+    report = Report(str(plugin_path))
+    for validator in VALIDATORS:
+        validator.validate(plugin_path, report)
+    return {
+        "plugin_path": str(plugin_path),
+        "manifest": manifest,
+        "marketplace": {k: k in marketplace for k in ("name", "owner")} if isinstance(marketplace, dict) else None,
+        "changelog": _changelog(plugin_path, manifest.get("fields", {}).get("version")),
+        "readme": _readme(plugin_path),
+        "license": [n for n in ("LICENSE", "LICENSE.md") if (plugin_path / n).exists()],
+        **_documents(plugin_path),
+        "hooks": _hooks(plugin_path),
+        "scan": _scan(plugin_path),
+        "git": _git(plugin_path),
+        "findings": [{"check_id": f.check_id, "severity": f.severity, "message": f.message}
+                     for f in report.findings],
+    }
+
+
+if __name__ == "__main__":
+    plugin_path = resolve_plugin_path()
+    print(json.dumps(build_digest(plugin_path), separators=(",", ":"), ensure_ascii=False))
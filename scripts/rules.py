@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Rule registry: checks declare the ids they emit, their inputs and prerequisites.
+
+Selection works on check ids (`--only hooks.*,schema.*`, `--skip conventions.possible_secret`).
+Only rules that can emit a selected id run, plus the rules they depend on. A rule that
+returns False fails as a prerequisite, and everything depending on it is skipped. When the
+failing prerequisite reported why, its findings are kept even if they were not selected, and
+an INFO `<validator>.skipped` names the skipped rules.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import Finding, Report, run_external
+
+RuleFunc = Callable[[Path, Report], "bool | None"]
+
+
+@dataclass
+class Rule:
+    name: str  # "<validator>:<rule>", e.g. "schema:manifest"
+    func: RuleFunc
+    emits: tuple[str, ...]
+    requires: tuple[str, ...] = ()
+    inputs: tuple[str, ...] = ()  # plugin-relative paths or globs the rule reads
+    command: Callable | None = None  # external rules: (plugin_path, report) -> (argv, cwd) | None
+    apply: Callable | None = None  # external rules: (plugin_path, report, result) -> None
+
+    @property
+    def validator(self) -> str:
+        return self.name.split(":", 1)[0]
+
+
+REGISTRY: dict[str, Rule] = {}
+
+
+def rule(name: str, emits: tuple[str, ...], requires: tuple[str, ...] = (),
+         inputs: tuple[str, ...] = ()) -> Callable[[RuleFunc], RuleFunc]:
+    """Register an in-process rule."""
+    def register(func: RuleFunc) -> RuleFunc:
+        REGISTRY[name] = Rule(name, func, emits, requires, inputs)
+        return func
+    return register
+
+
+def external_rule(name: str, emits: tuple[str, ...], command: Callable, apply: Callable,
+                  requires: tuple[str, ...] = (), inputs: tuple[str, ...] = ()) -> None:
+    """Register a rule backed by a subprocess; run_checks schedules it asynchronously."""
+    def func(plugin_path: Path, report: Report) -> None:
+        spec = command(plugin_path, report)
+        if spec is not None:
+            argv, cwd = spec
+            apply(plugin_path, report, run_external(argv, cwd))
+
+    REGISTRY[name] = Rule(name, func, emits, requires, inputs, command, apply)
+
+
+def parse_patterns(value: str | None) -> tuple[str, ...]:
+    return tuple(p.strip() for p in (value or "").split(",") if p.strip())
+
+
+def wanted(check_id: str, only: tuple[str, ...] = (), skip: tuple[str, ...] = ()) -> bool:
+    if only and not any(fnmatchcase(check_id, p) for p in only):
+        return False
+    return not any(fnmatchcase(check_id, p) for p in skip)
+
+
+def check_patterns(only: tuple[str, ...] = (), skip: tuple[str, ...] = ()) -> None:
+    """Raise ValueError for a pattern that matches no check id, which is almost always a typo.
+
+    --skip may also name the ids the runner itself adds (`<validator>.skipped` etc.).
+    """
+    emitted = {e for r in REGISTRY.values() for e in r.emits}
+    added = {f"{r.validator}.{kind}" for r in REGISTRY.values() for kind in ("skipped", "timeout", "crashed")}
+    for flag, patterns, ids in (("--only", only, emitted), ("--skip", skip, emitted | added)):
+        for p in patterns:
+            if not any(fnmatchcase(i, p) for i in ids):
+                raise ValueError(f"{flag} pattern '{p}' matches no check id")
+
+
+def plan(only: tuple[str, ...] = (), skip: tuple[str, ...] = ()) -> tuple[set[str], list[Rule]]:
+    """Selected rule names and the dependency-ordered rules needed to run them."""
+    check_patterns(only, skip)
+    selected = {r.name for r in REGISTRY.values() if any(wanted(e, only, skip) for e in r.emits)}
+    if (only or skip) and not selected:
+        raise ValueError("--only/--skip leave no check to run")
+    order: list[Rule] = []
+    state: dict[str, str] = {}
+
+    def visit(name: str) -> None:
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"rule dependency cycle at {name}")
+        if name not in REGISTRY:
+            raise ValueError(f"unknown rule dependency: {name}")
+        state[name] = "visiting"
+        for dep in REGISTRY[name].requires:
+            visit(dep)
+        state[name] = "done"
+        order.append(REGISTRY[name])
+
+    for name in REGISTRY:
+        if name in selected:
+            visit(name)
+    return selected, order
+
+
+def crash_finding(r: Rule, exc: BaseException) -> Finding:
+    """ERROR standing in for a rule that raised, so the rest of the run is still reported."""
+    return Finding(f"{r.validator}.crashed", "ERROR",
+                   f"Rule {r.name} crashed: {type(exc).__name__}: {exc}", {"rule": r.name})
+
+
+def blocked_by(order: list[Rule], selected: set[str], passed: dict[str, bool],
+               skipped: set[str]) -> dict[str, list[str]]:
+    """Map each failed prerequisite to the selected rules it kept from running."""
+    def causes(name: str):
+        for dep in REGISTRY[name].requires:
+            if dep in skipped:
+                yield from causes(dep)
+            elif passed.get(dep) is False:
+                yield dep
+
+    blocked: dict[str, list[str]] = {}
+    for r in order:
+        if r.name in selected and r.name in skipped:
+            for cause in dict.fromkeys(causes(r.name)):
+                blocked.setdefault(cause, []).append(r.name)
+    return blocked
+
+
+def report_skips(report: Report, blocked: dict[str, list[str]], reports: dict[str, Report]) -> None:
+    """Keep each failed prerequisite's findings and name the rules it skipped.
+
+    A prerequisite that failed without findings (e.g. no hooks.json at all) just means
+    there is nothing to check, so its dependents are skipped silently.
+    """
+    for prereq, names in blocked.items():
+        if not reports[prereq].findings:
+            continue
+        report.findings.extend(f for f in reports[prereq].findings if f not in report.findings)
+        by_validator: dict[str, list[str]] = {}
+        for name in names:
+            by_validator.setdefault(REGISTRY[name].validator, []).append(name)
+        for validator, rules in by_validator.items():
+            report.info(f"{validator}.skipped",
+                        f"validate_{validator} rules skipped: prerequisite {prereq} failed",
+                        rules=", ".join(rules), requires=prereq)
+
+
+def run_rules(plugin_path: Path, report: Report,
+              only: tuple[str, ...] = (), skip: tuple[str, ...] = ()) -> list[str]:
+    """Run the selected rules in dependency order; return names of skipped rules."""
+    selected, order = plan(only, skip)
+    passed: dict[str, bool] = {}
+    skipped: set[str] = set()
+    reports: dict[str, Report] = {}
+    for r in order:
+        if not all(passed.get(dep) for dep in r.requires):
+            passed[r.name] = False
+            skipped.add(r.name)
+            continue
+        reports[r.name] = Report(report.plugin_path)
+        try:
+            passed[r.name] = r.func(plugin_path, reports[r.name]) is not False
+        except Exception as e:
+            passed[r.name] = False
+            crash = crash_finding(r, e)
+            reports[r.name].findings.append(crash)
+            report.findings.append(crash)
+            continue
+        if r.name in selected:
+            report.findings.extend(f for f in reports[r.name].findings if wanted(f.check_id, only, skip))
+    report_skips(report, blocked_by(order, selected, passed, skipped), reports)
+    return [r.name for r in order if r.name in skipped]
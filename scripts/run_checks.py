@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Run the rule pipeline under one deadline, overlapping slow external checks with in-process ones."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import EXTERNAL_TIMEOUT, Report
+from rules import Rule, blocked_by, crash_finding, parse_patterns, plan, report_skips, wanted
+from store import record_run, selection_key
+import validate_consistency
+import validate_conventions
+import validate_hooks
+import validate_install_docs
+import validate_schema
+import validate_structure
+
+DEFAULT_DEADLINE = 30.0
+# Importing the validators registers their rules; findings are merged in this order.
+VALIDATORS = (validate_schema, validate_structure, validate_hooks,
+              validate_conventions, validate_consistency, validate_install_docs)
+
+
+async def _run_external(r: Rule, plugin_path: Path, report: Report, end: float) -> None:
+    """Spawn the rule's external check and feed the outcome back to it, bounded by `end`."""
+    spec = r.command(plugin_path, report)
+    if spec is None:
+        return
+    argv, cwd = spec
+    loop = asyncio.get_running_loop()
+    budget = max(0.0, min(EXTERNAL_TIMEOUT, end - loop.time()))
+    try:
+        # Own session so a timeout kills wrapper scripts together with their children.
+        proc = await asyncio.create_subprocess_exec(
+            *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            cwd=str(cwd) if cwd else None, start_new_session=True,
+        )
+    except OSError as e:
+        r.apply(plugin_path, report, e)
+        return
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=budget)
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        await proc.wait()
+        if isinstance(e, asyncio.CancelledError):
+            raise
+        r.apply(plugin_path, report, subprocess.TimeoutExpired(argv, budget))
+        return
+    r.apply(plugin_path, report, subprocess.CompletedProcess(
+        argv, proc.returncode,
+        stdout.decode("utf-8", errors="replace"), stderr.decode("utf-8", errors="replace"),
+    ))
+
+
+def _in_thread(r: Rule, plugin_path: Path, report: Report,
+               loop: asyncio.AbstractEventLoop) -> asyncio.Future:
+    """Run an in-process rule on a daemon thread.
+
+    Daemon threads let the run end at the deadline even if a rule is still
+    busy; its partial report is simply never merged.
+    """
+    fut = loop.create_future()
+
+    def resolve(result: bool | None, exc: BaseException | None) -> None:
+        if fut.done():
+            return
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(result)
+
+    def worker() -> None:
+        result, exc = None, None
+        try:
+            result = r.func(plugin_path, report)
+        except Exception as e:  # surfaced on the future, not swallowed
+            exc = e
+        try:
+            loop.call_soon_threadsafe(resolve, result, exc)
+        except RuntimeError:
+            pass  # loop already closed after the deadline
+
+    threading.Thread(target=worker, name=f"anvil-{r.name}", daemon=True).start()
+    return fut
+
+
+async def run_pipeline(plugin_path: Path, deadline: float = DEFAULT_DEADLINE,
+                       only: tuple[str, ...] = (), skip: tuple[str, ...] = ()) -> Report:
+    """Run the selected rules; each starts as soon as its prerequisites pass."""
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline
+    selected, order = plan(only, skip)
+    if not order:
+        return Report(str(plugin_path))
+    reports = {r.name: Report(str(plugin_path)) for r in order}
+    passed: dict[str, asyncio.Future] = {r.name: loop.create_future() for r in order}
+    timings: dict[str, float] = {}
+
+    skipped: set[str] = set()
+
+    async def run(r: Rule) -> None:
+        result = False
+        try:
+            deps = await asyncio.gather(*(passed[d] for d in r.requires))
+            if not all(deps):
+                skipped.add(r.name)
+                return
+            start = loop.time()
+            if r.command is not None:
+                await _run_external(r, plugin_path, reports[r.name], end)
+                result = None
+            else:
+                result = await _in_thread(r, plugin_path, reports[r.name], loop)
+            timings[r.name] = loop.time() - start
+        finally:
+            # Resolve even when the rule raises, so dependents don't wait for the deadline.
+            passed[r.name].set_result(result is not False)
+
+    tasks = {r.name: asyncio.create_task(run(r)) for r in order}
+    _, pending = await asyncio.wait(tasks.values(), timeout=max(0.0, end - loop.time()))
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    report = Report(str(plugin_path), timings=timings)
+    outcome = {name: fut.result() for name, fut in passed.items() if fut.done()}
+    blocked = blocked_by(order, selected, outcome, skipped)
+    timed_out: dict[str, list[str]] = {}
+    pipeline = [m.__name__.removeprefix("validate_") for m in VALIDATORS]
+    for r in sorted(order, key=lambda r: pipeline.index(r.validator)):
+        if r.name not in selected and r.name not in blocked:
+            continue
+        task = tasks[r.name]
+        if task in pending:
+            timed_out.setdefault(r.validator, []).append(r.name)
+            continue
+        crash = None
+        if task.exception() is not None:
+            crash = crash_finding(r, task.exception())
+            reports[r.name].findings.append(crash)
+        if r.name not in blocked:
+            report.findings.extend(f for f in reports[r.name].findings
+                                   if f is crash or wanted(f.check_id, only, skip))
+        else:
+            report_skips(report, {r.name: blocked[r.name]}, reports)
+    for validator, names in timed_out.items():
+        if wanted(f"{validator}.timeout", only, skip):
+            report.warn(f"{validator}.timeout",
+                        f"validate_{validator} did not finish within the {deadline:g}s deadline",
+                        rules=", ".join(names))
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", default=".", help="plugin root (default: cwd)")
+    parser.add_argument("--deadline", type=float, default=DEFAULT_DEADLINE,
+                        help=f"total seconds for all checks (default: {DEFAULT_DEADLINE:g})")
+    parser.add_argument("--only", help="comma-separated check-id globs to run, e.g. 'hooks.*,schema.*'")
+    parser.add_argument("--skip", help="comma-separated check-id globs to leave out")
+    parser.add_argument("--store", type=Path, metavar="DB",
+                        help="append this run's metadata, timings and findings to a SQLite database")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    only, skip = parse_patterns(args.only), parse_patterns(args.skip)
+    try:
+        plan(only, skip)
+    except ValueError as e:
+        parser.error(str(e))
+    started_at = datetime.datetime.now(datetime.timezone.utc)
+    start = time.monotonic()
+    report = asyncio.run(run_pipeline(Path(args.path).expanduser().resolve(), args.deadline, only, skip))
+    duration = time.monotonic() - start
+    if args.json:
+        print(report.to_json())
+    else:
+        report.print_human()
+    if args.store:
+        try:
+            record_run(args.store, report, started_at, duration, selection_key(only, skip))
+        except (sqlite3.Error, OSError) as e:
+            print(f"warning: could not record run in {args.store}: {e}", file=sys.stderr)
+    return 1 if report.has_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Deterministic plugin scaffolder: render templates/*.tmpl and run post-create checks."""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import re
+import shutil
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import Report, load_json_file
+import validate_conventions
+import validate_hooks
+import validate_schema
+import validate_structure
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+TEMPLATE_TARGETS = {
+    "plugin.json.tmpl": ".claude-plugin/plugin.json",
+    "README.md.tmpl": "README.md",
+    "LICENSE.tmpl": "LICENSE",
+    ".gitignore.tmpl": ".gitignore",
+    "CHANGELOG.md.tmpl": "CHANGELOG.md",
+}
+COMPONENT_DIRS = validate_structure.COMPONENT_DIRS
+# Files written into a selected component directory so it is valid from the start.
+COMPONENT_STUBS = {"hooks": ("hooks/hooks.json", '{\n  "hooks": {}\n}\n')}
+PLACEHOLDER_RE = re.compile(r"\{\{(NAME|DESCRIPTION|KEYWORDS|YEAR|DATE)\}\}")
+POST_CREATE_VALIDATORS = (validate_schema, validate_structure, validate_hooks, validate_conventions)
+
+
+@dataclass
+class PluginSpec:
+    name: str
+    description: str
+    keywords: list[str] = field(default_factory=list)
+    components: list[str] = field(default_factory=list)
+
+
+def default_root() -> Path:
+    fabrica_root = os.environ.get("FABRICA_ROOT")
+    if fabrica_root:
+        return Path(fabrica_root).expanduser().resolve()
+    return Path.home() / "personal" / "heurema" / "fabrica"
+
+
+def _split(value: object) -> list[str]:
+    """Accept either a list or a comma-separated string; drop empty and non-string tokens."""
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list):
+        return []
+    return [v.strip() for v in value if isinstance(v, str) and v.strip()]
+
+
+def _text(value: object) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def parse_spec(raw: dict) -> PluginSpec:
+    return PluginSpec(
+        name=_text(raw.get("name")),
+        description=_text(raw.get("description")),
+        keywords=_split(raw.get("keywords", [])),
+        components=_split(raw.get("components", [])),
+    )
+
+
+def load_spec_file(path: Path) -> list[PluginSpec]:
+    """Load one spec or a list of specs from JSON, or YAML if PyYAML is installed."""
+    if not path.is_file():
+        raise SystemExit(f"Spec file not found: {path}")
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit(f"PyYAML is required to read {path.name}; use a .json spec instead")
+        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    else:
+        data = load_json_file(path)
+        if data is None:
+            raise SystemExit(f"Spec file is not valid JSON: {path}")
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list) or not data or not all(isinstance(d, dict) for d in data):
+        raise SystemExit(f"Spec file must contain an object or a list of objects: {path}")
+    return [parse_spec(d) for d in data]
+
+
+def check_specs(specs: list[PluginSpec], root: Path) -> list[str]:
+    """Validate every spec up front so a batch is created all-or-nothing."""
+    errors: list[str] = []
+    seen: set[str] = set()
+    for spec in specs:
+        label = spec.name or "<unnamed>"
+        if not validate_schema.SLUG_RE.match(spec.name):
+            errors.append(f"{label}: name must match {validate_schema.SLUG_RE.pattern}")
+        if not spec.description:
+            errors.append(f"{label}: description is required")
+        unknown = [c for c in spec.components if c not in COMPONENT_DIRS]
+        if unknown:
+            errors.append(f"{label}: unknown components: {', '.join(unknown)}")
+        if spec.name in seen:
+            errors.append(f"{label}: listed more than once")
+        elif spec.name and (root / spec.name).exists():
+            errors.append(f"{label}: directory already exists: {root / spec.name}")
+        seen.add(spec.name)
+    return errors
+
+
+def render(template: str, spec: PluginSpec, today: datetime.date, json_escape: bool) -> str:
+    description = json.dumps(spec.description)[1:-1] if json_escape else spec.description
+    values = {
+        "NAME": spec.name,
+        "DESCRIPTION": description,
+        "KEYWORDS": ", ".join(json.dumps(k) for k in spec.keywords),
+        "YEAR": str(today.year),
+        "DATE": today.isoformat(),
+    }
+    # One pass, so placeholder-like text inside user values is left alone.
+    return PLACEHOLDER_RE.sub(lambda m: values[m.group(1)], template)
+
+
+def create(spec: PluginSpec, root: Path, templates: dict[str, str], today: datetime.date) -> Report:
+    """Write one plugin skeleton and return its post-create findings."""
+    plugin_root = root / spec.name
+    for component in spec.components:
+        (plugin_root / component).mkdir(parents=True, exist_ok=True)
+        if component in COMPONENT_STUBS:
+            target, content = COMPONENT_STUBS[component]
+            (plugin_root / target).write_text(content, encoding="utf-8")
+    for tmpl_name, target in TEMPLATE_TARGETS.items():
+        out = plugin_root / target
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(render(templates[tmpl_name], spec, today, out.suffix == ".json"), encoding="utf-8")
+
+    report = Report(str(plugin_root))
+    for validator in POST_CREATE_VALIDATORS:
+        validator.validate(plugin_root, report)
+    return report
+
+
+def _nothing_created(errors: list[str], as_json: bool) -> int:
+    if as_json:
+        print(json.dumps({"tool": "anvil", "errors": errors, "created": []}, indent=2))
+    else:
+        for e in errors:
+            print(f"  [ERROR] {e}")
+        print("\nNothing created.")
+    return 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("name", nargs="?", help="plugin name (lowercase slug)")
+    parser.add_argument("--description", default="")
+    parser.add_argument("--keywords", default="", help="comma-separated keywords")
+    parser.add_argument("--components", default="", help=f"comma-separated subset of {','.join(COMPONENT_DIRS)}")
+    parser.add_argument("--spec", type=Path, help="JSON/YAML spec: one object or a list for batch creation")
+    parser.add_argument("--root", type=Path, help="parent directory (default: $FABRICA_ROOT or ~/personal/heurema/fabrica)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.spec:
+        specs = load_spec_file(args.spec)
+    elif args.name:
+        specs = [parse_spec({"name": args.name, "description": args.description,
+                             "keywords": args.keywords, "components": args.components})]
+    else:
+        parser.error("either a plugin name or --spec is required")
+
+    root = args.root.expanduser().resolve() if args.root else default_root()
+    errors = check_specs(specs, root)
+    if errors:
+        return _nothing_created(errors, args.json)
+
+    templates = {name: (TEMPLATES_DIR / name).read_text(encoding="utf-8") for name in TEMPLATE_TARGETS}
+    today = datetime.date.today()
+    reports: list[Report] = []
+    written: list[Path] = []
+    for spec in specs:
+        # check_specs guarantees the directory is new, so removing it on failure is safe.
+        written.append(root / spec.name)
+        try:
+            reports.append(create(spec, root, templates, today))
+        except OSError as e:
+            for plugin_root in written:
+                shutil.rmtree(plugin_root, ignore_errors=True)
+            return _nothing_created([f"{spec.name}: {e}"], args.json)
+
+    if args.json:
+        print(json.dumps({"tool": "anvil", "errors": [], "created": [r.to_dict() for r in reports]}, indent=2))
+    else:
+        for report in reports:
+            s = report.summary
+            print(f"Created {report.plugin_path} ({s['error']} error, {s['warn']} warn, {s['info']} info)")
+            for f in report.findings:
+                print(f"  {f.severity:<5} [{f.check_id}] {f.message}")
+    return 1 if any(r.has_errors for r in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Opt-in SQLite history of anvil runs: run metadata, per-rule timings and findings."""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import sqlite3
+import subprocess
+import sys
+from contextlib import closing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import ANVIL_VERSION, Finding, Report, load_json_file
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    plugin TEXT NOT NULL,
+    plugin_path TEXT NOT NULL,
+    plugin_version TEXT,
+    git_commit TEXT,
+    anvil_version TEXT NOT NULL,
+    selection TEXT NOT NULL DEFAULT '',
+    duration REAL NOT NULL,
+    exit_code INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    warns INTEGER NOT NULL,
+    infos INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    validator TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    check_id TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    message TEXT NOT NULL,
+    sources TEXT NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_plugin_selection_time ON runs(plugin, selection, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_time ON runs(started_at);
+CREATE INDEX IF NOT EXISTS idx_timings_run ON timings(run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_run ON findings(run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_check ON findings(check_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_hash ON findings(hash);
+"""
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+POSITION_SOURCES = ("line",)
+
+
+def finding_hash(f: Finding) -> str:
+    """Content hash that identifies the same finding across runs.
+
+    Position-only sources are left out (they stay in the stored sources), so editing
+    text above a finding does not make it look resolved and new.
+    """
+    sources = {k: v for k, v in f.sources.items() if k not in POSITION_SOURCES}
+    payload = json.dumps([f.check_id, f.severity, f.message, sources], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def selection_key(only: tuple[str, ...] = (), skip: tuple[str, ...] = ()) -> str:
+    """Canonical --only/--skip string; "" for a full run. Only runs with equal keys are compared."""
+    return " ".join(f"--{flag} {','.join(sorted(patterns))}"
+                    for flag, patterns in (("only", only), ("skip", skip)) if patterns)
+
+
+def _git_commit(plugin_path: Path) -> str | None:
+    try:
+        result = subprocess.run(["git", "-C", str(plugin_path), "rev-parse", "HEAD"],
+                                capture_output=True, text=True, timeout=5)
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def record_run(db_path: Path, report: Report, started_at: datetime.datetime,
+               duration: float, selection: str = "") -> int:
+    """Append one run with its timings and findings; return the run id."""
+    plugin_path = Path(report.plugin_path)
+    pj = load_json_file(plugin_path / ".claude-plugin" / "plugin.json")
+    pj = pj if isinstance(pj, dict) else {}
+    name = pj.get("name") if isinstance(pj.get("name"), str) else plugin_path.name
+    version = pj.get("version") if isinstance(pj.get("version"), str) else None
+    s = report.summary
+
+    with closing(connect(db_path)) as conn, conn:
+        cur = conn.execute(
+            "INSERT INTO runs (started_at, plugin, plugin_path, plugin_version, git_commit, anvil_version,"
+            " selection, duration, exit_code, errors, warns, infos)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (started_at.isoformat(timespec="seconds"), name, str(plugin_path), version,
+             _git_commit(plugin_path), ANVIL_VERSION, selection, round(duration, 4),
+             1 if report.has_errors else 0, s["error"], s["warn"], s["info"]),
+        )
+        run_id = cur.lastrowid
+        conn.executemany(
+            "INSERT INTO timings (run_id, validator, rule, seconds) VALUES (?, ?, ?, ?)",
+            [(run_id, rule.split(":", 1)[0], rule, round(sec, 4)) for rule, sec in report.timings.items()],
+        )
+        conn.executemany(
+            "INSERT INTO findings (run_id, check_id, severity, message, sources, hash) VALUES (?, ?, ?, ?, ?, ?)",
+            [(run_id, f.check_id, f.severity, f.message, json.dumps(f.sources, sort_keys=True), finding_hash(f))
+             for f in report.findings],
+        )
+    return run_id
+
+
+def trends(conn: sqlite3.Connection, plugin: str | None = None, limit: int = 20,
+           selection: str | None = "") -> list[dict]:
+    """Most recent runs, newest first, with duration and severity counts.
+
+    `selection` keeps runs with that --only/--skip key ("" = full runs); None keeps all runs.
+    """
+    rows = conn.execute(
+        "SELECT id, started_at, plugin, plugin_version, git_commit, duration, errors, warns, infos, selection"
+        " FROM runs WHERE (? IS NULL OR plugin = ?) AND (? IS NULL OR selection = ?)"
+        " ORDER BY started_at DESC, id DESC LIMIT ?",
+        (plugin, plugin, selection, selection, limit),
+    )
+    return [dict(r) for r in rows]
+
+
+def slowdowns(conn: sqlite3.Connection, plugin: str | None = None, window: int = 5,
+              limit: int = 10, selection: str | None = "") -> list[dict]:
+    """Plugins whose last `window` runs are slower on average than the `window` before them."""
+    rows = conn.execute(
+        "SELECT plugin, AVG(CASE WHEN rn <= ? THEN duration END) AS recent_seconds,"
+        " AVG(CASE WHEN rn > ? THEN duration END) AS previous_seconds FROM ("
+        "  SELECT plugin, duration,"
+        "   ROW_NUMBER() OVER (PARTITION BY plugin ORDER BY started_at DESC, id DESC) AS rn"
+        "  FROM runs WHERE (? IS NULL OR plugin = ?) AND (? IS NULL OR selection = ?)"
+        " ) WHERE rn <= ? GROUP BY plugin"
+        " HAVING previous_seconds > 0 AND recent_seconds > previous_seconds"
+        " ORDER BY recent_seconds / previous_seconds DESC LIMIT ?",
+        (window, window, plugin, plugin, selection, selection, 2 * window, limit),
+    )
+    return [dict(r) for r in rows]
+
+
+def last_two_runs(conn: sqlite3.Connection, plugin: str, selection: str | None = "") -> tuple[int, int] | None:
+    rows = conn.execute(
+        "SELECT id FROM runs WHERE plugin = ? AND (? IS NULL OR selection = ?)"
+        " ORDER BY started_at DESC, id DESC LIMIT 2", (plugin, selection, selection),
+    ).fetchall()
+    return (rows[1]["id"], rows[0]["id"]) if len(rows) == 2 else None
+
+
+def run_selections(conn: sqlite3.Connection, *run_ids: int) -> dict[int, str]:
+    rows = conn.execute(f"SELECT id, selection FROM runs WHERE id IN ({','.join('?' * len(run_ids))})", run_ids)
+    return {r["id"]: r["selection"] for r in rows}
+
+
+def diff_runs(conn: sqlite3.Connection, old_run: int, new_run: int) -> dict[str, list[dict]]:
+    """Findings present only in new_run ("new") and only in old_run ("resolved"), by content hash."""
+    query = (
+        "SELECT check_id, severity, message, sources FROM findings WHERE run_id = ?"
+        " AND hash NOT IN (SELECT hash FROM findings WHERE run_id = ?) ORDER BY check_id"
+    )
+    return {
+        "new": [dict(r) for r in conn.execute(query, (new_run, old_run))],
+        "resolved": [dict(r) for r in conn.execute(query, (old_run, new_run))],
+    }
+
+
+def first_seen(conn: sqlite3.Connection, check_id: str, plugin: str | None = None) -> list[dict]:
+    """Per plugin: when a check id first and last appeared, and in how many runs."""
+    rows = conn.execute(
+        "SELECT r.plugin, MIN(r.started_at) AS first_seen, MAX(r.started_at) AS last_seen,"
+        " COUNT(DISTINCT r.id) AS runs"
+        " FROM findings f JOIN runs r ON r.id = f.run_id"
+        " WHERE f.check_id = ? AND (? IS NULL OR r.plugin = ?)"
+        " GROUP BY r.plugin ORDER BY first_seen",
+        (check_id, plugin, plugin),
+    )
+    return [dict(r) for r in rows]
+
+
+def slowest(conn: sqlite3.Connection, by: str = "validator", since: str | None = None,
+            limit: int = 10, selection: str | None = "") -> list[dict]:
+    """Average seconds per run grouped by validator, rule or plugin, slowest first."""
+    if by == "plugin":
+        rows = conn.execute(
+            "SELECT plugin AS name, COUNT(*) AS runs, AVG(duration) AS avg_seconds,"
+            " MAX(duration) AS max_seconds FROM runs WHERE (? IS NULL OR started_at >= ?)"
+            " AND (? IS NULL OR selection = ?)"
+            " GROUP BY plugin ORDER BY avg_seconds DESC LIMIT ?",
+            (since, since, selection, selection, limit),
+        )
+        return [dict(r) for r in rows]
+    if by not in ("validator", "rule"):
+        raise ValueError(f"unknown grouping: {by}")
+    # Sum rule times per run first, so a validator's cost is comparable across runs.
+    rows = conn.execute(
+        f"SELECT name, COUNT(*) AS runs, AVG(seconds) AS avg_seconds, MAX(seconds) AS max_seconds FROM ("
+        f" SELECT t.{by} AS name, t.run_id, SUM(t.seconds) AS seconds"
+        f" FROM timings t JOIN runs r ON r.id = t.run_id WHERE (? IS NULL OR r.started_at >= ?)"
+        f" AND (? IS NULL OR r.selection = ?)"
+        f" GROUP BY t.{by}, t.run_id"
+        f") GROUP BY name ORDER BY avg_seconds DESC LIMIT ?",
+        (since, since, selection, selection, limit),
+    )
+    return [dict(r) for r in rows]
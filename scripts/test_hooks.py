@@ -1,18 +1,23 @@
 #!/usr/bin/env python3
-"""Fixture-driven hook test runner."""
+"""Fixture-driven hook test runner with duration-aware sharding."""
 
 from __future__ import annotations
 
+import argparse
+import heapq
 import json
 import os
 import subprocess
 import sys
+import time
+import zlib
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from common import resolve_plugin_path, load_json_file
+from common import load_json_file
 
 DEFAULT_TIMEOUT = 10
+DEFAULT_TIMINGS = Path(".anvil") / "hook-timings.json"
 
 
 def discover_fixtures(plugin_path: Path) -> list[Path]:
@@ -80,18 +85,124 @@ def run_case(plugin_path: Path, case_path: Path) -> tuple[bool, str]:
     return True, f"{name}: PASS"
 
 
+def case_key(plugin_path: Path, case_path: Path) -> str:
+    """Stable identifier of a case across machines: its directory relative to the plugin."""
+    return case_path.parent.relative_to(plugin_path).as_posix()
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse 'i/N' (1-based) into (index, total)."""
+    try:
+        index, total = (int(x) for x in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got {value!r}")
+    if total < 1 or not 1 <= index <= total:
+        raise argparse.ArgumentTypeError(f"shard index must be within 1..N, got {value!r}")
+    return index, total
+
+
+def load_timings(path: Path) -> dict[str, float]:
+    data = load_json_file(path)
+    if not isinstance(data, dict):
+        return {}
+    return {k: float(v) for k, v in data.items() if isinstance(v, (int, float)) and v >= 0}
+
+
+def save_timings(path: Path, timings: dict[str, float]) -> None:
+    """Merge into the existing file, keeping cases this run didn't execute."""
+    merged = load_timings(path)
+    merged.update({k: round(v, 4) for k, v in timings.items()})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(dict(sorted(merged.items())), indent=2) + "\n", encoding="utf-8")
+    tmp.replace(path)
+
+
+def shard_timings_path(path: Path, index: int, total: int) -> Path:
+    """Where a sharded run records durations, leaving the shared history file untouched.
+
+    Every shard must read the same history to agree on the split, so shards never
+    rewrite it; --merge-timings folds their files in for the next run.
+    """
+    return path.with_name(f"{path.stem}.shard-{index}-of-{total}{path.suffix}")
+
+
+def merge_shard_timings(path: Path) -> int:
+    """Fold all shard timing files next to `path` into it; return how many were merged."""
+    shard_files = sorted(path.parent.glob(f"{path.stem}.shard-*{path.suffix}"))
+    for shard_file in shard_files:
+        save_timings(path, load_timings(shard_file))
+        shard_file.unlink()
+    return len(shard_files)
+
+
+def assign_shards(keys: list[str], total: int, timings: dict[str, float]) -> list[list[str]]:
+    """Split case keys into `total` shards.
+
+    With recorded durations, greedy longest-first bin packing: each case goes to the
+    currently lightest shard, and cases without history are costed at the mean.
+    Without any history, cases are spread by a stable hash of their key.
+    Every runner computes the same assignment from the same keys and timings file.
+    """
+    shards: list[list[str]] = [[] for _ in range(total)]
+    known = [timings[k] for k in keys if k in timings]
+    if not known:
+        for k in keys:
+            shards[zlib.crc32(k.encode("utf-8")) % total].append(k)
+        return shards
+
+    mean = sum(known) / len(known)
+    loads = [(0.0, i) for i in range(total)]
+    for k in sorted(keys, key=lambda k: (-timings.get(k, mean), k)):
+        load, i = heapq.heappop(loads)
+        shards[i].append(k)
+        heapq.heappush(loads, (load + timings.get(k, mean), i))
+    return shards
+
+
 def main() -> int:
-    plugin_path = resolve_plugin_path()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?", default=".", help="plugin root (default: cwd)")
+    parser.add_argument("--shard", type=parse_shard, metavar="i/N",
+                        help="run only shard i of N (1-based), balanced by recorded durations")
+    parser.add_argument("--timings", type=Path,
+                        help=f"per-case duration history for sharding; also records an unsharded run "
+                             f"(default: <plugin>/{DEFAULT_TIMINGS.as_posix()})")
+    parser.add_argument("--merge-timings", action="store_true",
+                        help="fold shard timing files into the history file and exit")
+    args = parser.parse_args()
+
+    plugin_path = Path(args.path).expanduser().resolve()
+    timings_path = args.timings if args.timings else plugin_path / DEFAULT_TIMINGS
+    if args.merge_timings:
+        count = merge_shard_timings(timings_path)
+        print(f"Merged {count} shard timing file(s) into {timings_path}")
+        return 0
+
     fixtures = discover_fixtures(plugin_path)
 
     if not fixtures:
         print("No hook test fixtures found.")
         return 0
 
+    timings = load_timings(timings_path)
+    if args.shard:
+        index, total = args.shard
+        by_key = {case_key(plugin_path, c): c for c in fixtures}
+        mine = set(assign_shards(list(by_key), total, timings)[index - 1])
+        fixtures = [c for k, c in by_key.items() if k in mine]
+        estimate = sum(timings.get(k, 0.0) for k in mine)
+        print(f"Shard {index}/{total}: {len(fixtures)} of {len(by_key)} cases (recorded {estimate:.2f}s)")
+        if not fixtures:
+            return 0
+
     passed = 0
     failed = 0
+    durations: dict[str, float] = {}
     for case_path in fixtures:
+        start = time.monotonic()
         ok, msg = run_case(plugin_path, case_path)
+        durations[case_key(plugin_path, case_path)] = time.monotonic() - start
         status = "PASS" if ok else "FAIL"
         print(f"  [{status}] {msg}")
         if ok:
@@ -99,6 +210,14 @@ def main() -> int:
         else:
             failed += 1
 
+    # Plain runs leave the plugin untouched; history is only kept when sharding asks for it.
+    if args.shard or args.timings:
+        record_path = shard_timings_path(timings_path, *args.shard) if args.shard else timings_path
+        try:
+            save_timings(record_path, durations)
+        except OSError as e:
+            print(f"  (could not write timings to {record_path}: {e})")
+
     print(f"\n{passed + failed} tests: {passed} passed, {failed} failed")
     return 1 if failed > 0 else 0
 
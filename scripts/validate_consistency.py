@@ -1,48 +1,203 @@
 #!/usr/bin/env python3
-"""Thin adapter: delegates to fabrica/scripts/check_consistency.py."""
+"""Cross-plugin consistency checks over a native fabrica workspace index.
+
+The index is built in one pass over every `*/.claude-plugin/plugin.json` and
+`marketplace.json` in the workspace; all checks are dict lookups against it.
+fabrica/scripts/check_consistency.py, when present, still runs on top.
+"""
 
 from __future__ import annotations
 
+import argparse
 import json
 import os
+import re
 import subprocess
 import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from common import Report, resolve_plugin_path
+from common import Report, load_json_file
+from markdown_index import load_markdown
+from rules import external_rule, rule, run_rules
+import validate_schema  # registers schema:manifest, which every rule here requires
 
 SEVERITY_MAP = {"CRITICAL": "ERROR", "HIGH": "ERROR", "MEDIUM": "WARN", "LOW": "INFO"}
+INSTALL_REF_RE = re.compile(r"claude\s+plugin\s+install\s+([a-z0-9][a-z0-9-]*)@([\w.-]+)")
 
 
-def validate(plugin_path: Path, report: Report) -> None:
-    # Detect fabrica root
-    fabrica_root = os.environ.get("FABRICA_ROOT")
-    if fabrica_root:
-        fabrica_root = Path(fabrica_root)
-    else:
-        # Heuristic: parent of plugin dir in fabrica workspace
-        fabrica_root = plugin_path.parent
+@dataclass
+class PluginEntry:
+    name: str
+    path: Path
+    version: str | None = None
+    author: str = ""
+    install_refs: list[tuple[str, str]] = field(default_factory=list)  # (name, marketplace)
+
+
+@dataclass
+class MarketplaceEntry:
+    marketplace: str
+    name: str
+    path: Path  # directory holding .claude-plugin/marketplace.json
+    version: str | None = None
+    author: str = ""
+    source: str = ""
+
+
+@dataclass
+class WorkspaceIndex:
+    root: Path
+    plugins: dict[str, list[PluginEntry]] = field(default_factory=dict)
+    by_path: dict[Path, PluginEntry] = field(default_factory=dict)
+    marketplaces: dict[str, dict[str, MarketplaceEntry]] = field(default_factory=dict)
+    duplicate_entries: list[MarketplaceEntry] = field(default_factory=list)
+
+    def add_plugin(self, plugin_dir: Path, pj: dict) -> None:
+        name = pj.get("name")
+        if not isinstance(name, str) or not name or plugin_dir in self.by_path:
+            return
+        version = pj.get("version")
+        entry = PluginEntry(
+            name=name,
+            path=plugin_dir,
+            version=version if isinstance(version, str) else None,
+            author=_author_name(pj.get("author")),
+            install_refs=_install_refs(plugin_dir / "README.md"),
+        )
+        self.plugins.setdefault(name, []).append(entry)
+        self.by_path[plugin_dir] = entry
+
+    def add_marketplace(self, market_dir: Path, mj: dict) -> None:
+        market = mj.get("name")
+        plugins = mj.get("plugins")
+        if not isinstance(market, str) or not market or not isinstance(plugins, list):
+            return
+        entries = self.marketplaces.setdefault(market, {})
+        for p in plugins:
+            if not isinstance(p, dict) or not isinstance(p.get("name"), str):
+                continue
+            version = p.get("version")
+            source = p.get("source", "")
+            entry = MarketplaceEntry(
+                marketplace=market,
+                name=p["name"],
+                path=market_dir,
+                version=version if isinstance(version, str) else None,
+                author=_author_name(p.get("author")),
+                source=source if isinstance(source, str) else "",
+            )
+            if entry.name in entries:
+                self.duplicate_entries.append(entry)
+            else:
+                entries[entry.name] = entry
+
+
+def _author_name(author: object) -> str:
+    if isinstance(author, dict):
+        name = author.get("name", "")
+        return name if isinstance(name, str) else ""
+    return author if isinstance(author, str) else ""
+
+
+def _install_refs(readme: Path) -> list[tuple[str, str]]:
+    doc = load_markdown(readme)
+    return INSTALL_REF_RE.findall(doc.text) if doc else []
+
+
+def build_index(root: Path, extra: tuple[Path, ...] = ()) -> WorkspaceIndex:
+    """Index every plugin and marketplace manifest at root and one level below it."""
+    index = WorkspaceIndex(root)
+    manifests = sorted(root.glob(".claude-plugin/*.json")) + sorted(root.glob("*/.claude-plugin/*.json"))
+    manifests += [p / ".claude-plugin" / n for p in extra for n in ("plugin.json", "marketplace.json")]
+    for manifest in dict.fromkeys(m.resolve() for m in manifests):
+        if manifest.name not in ("plugin.json", "marketplace.json"):
+            continue
+        data = load_json_file(manifest)
+        if not isinstance(data, dict):
+            continue
+        owner = manifest.parent.parent
+        if manifest.name == "plugin.json":
+            index.add_plugin(owner, data)
+        else:
+            index.add_marketplace(owner, data)
+    return index
+
+
+def check_index(index: WorkspaceIndex, report: Report, only: Path | None = None) -> None:
+    """Run cross-plugin checks; with `only`, keep findings that involve that directory."""
+
+    def concerns(*paths: Path | None) -> bool:
+        return only is None or only in paths
+
+    # Duplicate plugin names
+    for name, entries in index.plugins.items():
+        if len(entries) > 1 and concerns(*(e.path for e in entries)):
+            report.error("consistency.duplicate_name",
+                         f"Plugin name '{name}' is used by {len(entries)} directories",
+                         name=name, paths=", ".join(e.path.name for e in entries))
+
+    # Marketplace entries vs plugin manifests
+    for market, entries in index.marketplaces.items():
+        for name, entry in entries.items():
+            candidates = index.plugins.get(name, [])
+            plugin = candidates[0] if len(candidates) == 1 else None
+            if not concerns(entry.path, plugin.path if plugin else None):
+                continue
+            if not candidates:
+                local = entry.source.startswith(".") and \
+                    (entry.path / entry.source / ".claude-plugin" / "plugin.json").exists()
+                if not local:
+                    report.warn("consistency.marketplace_missing_plugin",
+                                f"Marketplace '{market}' lists '{name}' but no such plugin is in the workspace",
+                                marketplace=market, plugin=name)
+                continue
+            if plugin is None:
+                continue  # ambiguous; reported as duplicate_name
+            if entry.version and plugin.version and entry.version != plugin.version:
+                report.error("consistency.version_drift",
+                             f"Marketplace '{market}' version for '{name}' doesn't match plugin.json",
+                             marketplace_version=entry.version, plugin_version=plugin.version)
+            if entry.author and plugin.author and entry.author != plugin.author:
+                report.warn("consistency.author_drift",
+                            f"Marketplace '{market}' author for '{name}' doesn't match plugin.json",
+                            marketplace_author=entry.author, plugin_author=plugin.author)
 
+    for entry in index.duplicate_entries:
+        if concerns(entry.path):
+            report.warn("consistency.marketplace_duplicate",
+                        f"Marketplace '{entry.marketplace}' lists '{entry.name}' more than once",
+                        marketplace=entry.marketplace, plugin=entry.name)
+
+    # README install commands must reference a marketplace that lists the plugin
+    for plugin in index.by_path.values():
+        if not concerns(plugin.path):
+            continue
+        for name, market in plugin.install_refs:
+            entries = index.marketplaces.get(market)
+            if entries is not None and name not in entries:
+                report.warn("consistency.not_in_marketplace",
+                            f"README installs '{name}@{market}' but marketplace '{market}' doesn't list it",
+                            plugin=name, marketplace=market)
+
+
+def external_command(plugin_path: Path, report: Report) -> tuple[list[str], Path] | None:
+    """argv and cwd for fabrica/scripts/check_consistency.py, or None if it isn't there."""
+    fabrica_root = resolve_fabrica_root(plugin_path)
     script = fabrica_root / "scripts" / "check_consistency.py"
     if not script.exists():
-        report.info("consistency.no_script",
-                    "fabrica/scripts/check_consistency.py not found — skipping cross-repo checks",
-                    fabrica_root=str(fabrica_root))
-        return
+        return None
+    return [sys.executable, str(script), "--json"], fabrica_root
 
-    # Run check_consistency.py with --json
-    try:
-        result = subprocess.run(
-            [sys.executable, str(script), "--json"],
-            capture_output=True, text=True, timeout=30,
-            cwd=str(fabrica_root),
-        )
-    except subprocess.TimeoutExpired:
-        report.warn("consistency.timeout", "check_consistency.py timed out (30s)")
+
+def apply_external_result(plugin_path: Path, report: Report,
+                          result: subprocess.CompletedProcess | subprocess.TimeoutExpired | OSError) -> None:
+    if isinstance(result, subprocess.TimeoutExpired):
+        report.warn("consistency.timeout", f"check_consistency.py timed out ({result.timeout:.0f}s)")
         return
-    except OSError as e:
-        report.warn("consistency.exec_error", f"Failed to run check_consistency.py: {e}")
+    if isinstance(result, OSError):
+        report.warn("consistency.exec_error", f"Failed to run check_consistency.py: {result}")
         return
 
     # Parse JSON output
@@ -69,12 +224,58 @@ def validate(plugin_path: Path, report: Report) -> None:
         )
 
 
-if __name__ == "__main__":
-    plugin_path = resolve_plugin_path()
-    report = Report(str(plugin_path))
-    validate(plugin_path, report)
-    if "--json" in sys.argv:
+def resolve_fabrica_root(plugin_path: Path) -> Path:
+    fabrica_root = os.environ.get("FABRICA_ROOT")
+    if fabrica_root:
+        return Path(fabrica_root).resolve()
+    # Heuristic: parent of plugin dir in fabrica workspace
+    return plugin_path.parent
+
+
+@rule("consistency:workspace",
+      emits=("consistency.duplicate_name", "consistency.marketplace_missing_plugin",
+             "consistency.version_drift", "consistency.author_drift",
+             "consistency.marketplace_duplicate", "consistency.not_in_marketplace"),
+      requires=("schema:manifest",), inputs=("../*/.claude-plugin/*.json", "../*/README.md"))
+def check_workspace(plugin_path: Path, report: Report) -> None:
+    index = build_index(resolve_fabrica_root(plugin_path), extra=(plugin_path,))
+    check_index(index, report, only=plugin_path)
+
+
+external_rule("consistency:external",
+              emits=("consistency.timeout", "consistency.exec_error", "consistency.parse_error",
+                     *(f"consistency.{s.lower()}" for s in SEVERITY_MAP), "consistency.unknown"),
+              command=external_command, apply=apply_external_result,
+              requires=("schema:manifest",), inputs=("../scripts/check_consistency.py",))
+
+
+def validate(plugin_path: Path, report: Report) -> None:
+    run_rules(plugin_path, report, only=("consistency.*",))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?",
+                        help="plugin root (default: cwd); with --workspace, the workspace root "
+                             "(default: $FABRICA_ROOT or cwd)")
+    parser.add_argument("--workspace", action="store_true", help="check every plugin in the workspace")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.workspace:
+        root = Path(args.path or os.environ.get("FABRICA_ROOT") or ".").expanduser().resolve()
+        report = Report(str(root))
+        check_index(build_index(root), report)
+    else:
+        target = Path(args.path or ".").expanduser().resolve()
+        report = Report(str(target))
+        validate(target, report)
+    if args.json:
         print(report.to_json())
     else:
         report.print_human()
-    sys.exit(1 if report.has_errors else 0)
+    return 1 if report.has_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
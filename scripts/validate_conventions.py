@@ -8,7 +8,10 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from common import Report, resolve_plugin_path
+from common import Report, resolve_plugin_path, extract_frontmatter_field
+from markdown_index import load_markdown
+from rules import rule, run_rules
+import validate_schema  # registers schema:manifest, which every rule here requires
 
 FIRST_PERSON_RE = re.compile(r'\b(I |You |My |Your )', re.IGNORECASE)
 SECRET_PATTERNS = re.compile(r'(api[_-]?key|token|password|secret)\s*[:=]', re.IGNORECASE)
@@ -16,18 +19,29 @@ HARDCODED_PATH_RE = re.compile(r'/Users/|/home/')
 TEMPLATE_EXTENSIONS = {".tmpl", ".template", ".j2"}
 
 
-def validate(plugin_path: Path, report: Report) -> None:
+@rule("conventions:commands", emits=("conventions.no_static_injection",),
+      requires=("schema:manifest",), inputs=("commands/*.md",))
+def check_commands(plugin_path: Path, report: Report) -> None:
     # Commands: check for @${CLAUDE_PLUGIN_ROOT} file injection
     cmd_dir = plugin_path / "commands"
     if cmd_dir.is_dir():
         for f in cmd_dir.glob("*.md"):
-            content = f.read_text(encoding="utf-8")
+            doc = load_markdown(f, frontmatter=True)
+            if doc is None:
+                continue
             # Check for runtime Read of plugin files (anti-pattern)
-            if "Read tool" in content and "${CLAUDE_PLUGIN_ROOT}" not in content:
+            read_line = doc.find("Read tool")
+            if read_line is not None and doc.find("${CLAUDE_PLUGIN_ROOT}") is None:
                 report.info("conventions.no_static_injection",
                             f"Command {f.name} may use runtime Read instead of @${{CLAUDE_PLUGIN_ROOT}}",
-                            file=str(f.relative_to(plugin_path)))
+                            file=str(f.relative_to(plugin_path)), line=str(read_line))
+
 
+@rule("conventions:skills",
+      emits=("conventions.skill_no_description", "conventions.skill_description_long",
+             "conventions.skill_first_person", "conventions.skill_missing_keywords"),
+      requires=("schema:manifest",), inputs=("skills/*/SKILL.md",))
+def check_skills(plugin_path: Path, report: Report) -> None:
     # Skills: description checks
     skills_dir = plugin_path / "skills"
     if skills_dir.is_dir():
@@ -40,7 +54,7 @@ def validate(plugin_path: Path, report: Report) -> None:
             content = skill_file.read_text(encoding="utf-8")
 
             # Extract description from frontmatter
-            desc = _extract_frontmatter_field(content, "description")
+            desc = extract_frontmatter_field(content, "description")
             if not desc:
                 report.warn("conventions.skill_no_description",
                             f"Skill {d.name} has no description in frontmatter", skill=d.name)
@@ -64,17 +78,25 @@ def validate(plugin_path: Path, report: Report) -> None:
                             f"Skill {d.name} description missing keywords: {', '.join(missing)}",
                             skill=d.name)
 
+
+@rule("conventions:agents", emits=("conventions.agent_missing_field",),
+      requires=("schema:manifest",), inputs=("agents/*.md",))
+def check_agents(plugin_path: Path, report: Report) -> None:
     # Agents: required frontmatter fields
     agents_dir = plugin_path / "agents"
     if agents_dir.is_dir():
         for f in agents_dir.glob("*.md"):
             content = f.read_text(encoding="utf-8")
             for field in ("name", "description", "model", "tools"):
-                if not _extract_frontmatter_field(content, field):
+                if not extract_frontmatter_field(content, field):
                     report.warn("conventions.agent_missing_field",
                                 f"Agent {f.name} missing frontmatter field: {field}",
                                 file=f.name, field=field)
 
+
+@rule("conventions:files", emits=("conventions.hardcoded_path", "conventions.possible_secret"),
+      requires=("schema:manifest",), inputs=("**/*",))
+def check_files(plugin_path: Path, report: Report) -> None:
     # Global: no hardcoded paths or secrets (skip templates)
     for f in plugin_path.rglob("*"):
         if not f.is_file() or f.suffix in TEMPLATE_EXTENSIONS:
@@ -97,29 +119,8 @@ def validate(plugin_path: Path, report: Report) -> None:
                         f"Possible secret pattern in {rel}", file=rel)
 
 
-def _extract_frontmatter_field(content: str, field: str) -> str:
-    """Extract a field value from YAML frontmatter (simple parser)."""
-    if not content.startswith("---"):
-        return ""
-    end = content.find("---", 3)
-    if end == -1:
-        return ""
-    fm = content[3:end]
-    for line in fm.split("\n"):
-        if line.strip().startswith(f"{field}:"):
-            value = line.split(":", 1)[1].strip()
-            if value == "|" or value == ">":
-                # Multi-line value: collect indented lines
-                lines = []
-                idx = fm.find(line) + len(line) + 1
-                for sub_line in fm[idx:].split("\n"):
-                    if sub_line and (sub_line[0] == " " or sub_line[0] == "\t"):
-                        lines.append(sub_line.strip())
-                    else:
-                        break
-                return " ".join(lines)
-            return value.strip('"').strip("'")
-    return ""
+def validate(plugin_path: Path, report: Report) -> None:
+    run_rules(plugin_path, report, only=("conventions.*",))
 
 
 if __name__ == "__main__":
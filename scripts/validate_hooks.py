@@ -10,6 +10,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from common import Report, resolve_plugin_path, load_json_file
+from rules import rule, run_rules
 
 DANGEROUS_PATTERNS = [
     (re.compile(r'\beval\s'), "eval usage"),
@@ -24,26 +25,13 @@ VALID_EVENTS = {
 }
 
 
-def validate(plugin_path: Path, report: Report) -> None:
-    hooks_json_path = plugin_path / "hooks" / "hooks.json"
-    hooks_data = load_json_file(hooks_json_path)
-
-    if hooks_data is None:
-        if (plugin_path / "hooks").is_dir():
-            report.warn("hooks.no_hooks_json", "hooks/ directory exists but no hooks.json found")
-        return  # no hooks, nothing to validate
-
-    if not isinstance(hooks_data, dict):
-        report.error("hooks.invalid_schema", "hooks.json must be a JSON object")
-        return
-
-    hooks_field = hooks_data.get("hooks", [])
-
-    # Normalize two formats:
-    # Array format: {"hooks": [{"event": "SessionStart", "matcher": "...", "hooks": [...]}]}
-    # Object format: {"hooks": {"SessionStart": [{"matcher": "...", "hooks": [...]}]}}
-    normalized: list[tuple[str, dict]] = []  # (event_name, hook_entry)
+def normalize_hooks(hooks_field: object) -> list[tuple[str, dict]] | None:
+    """Flatten both hooks.json layouts into (event_name, hook_entry) pairs; None if invalid.
 
+    Array format: {"hooks": [{"event": "SessionStart", "matcher": "...", "hooks": [...]}]}
+    Object format: {"hooks": {"SessionStart": [{"matcher": "...", "hooks": [...]}]}}
+    """
+    normalized: list[tuple[str, dict]] = []
     if isinstance(hooks_field, list):
         for hook in hooks_field:
             normalized.append((hook.get("event", ""), hook))
@@ -53,10 +41,50 @@ def validate(plugin_path: Path, report: Report) -> None:
                 for entry in entries:
                     normalized.append((event_name, entry))
     else:
+        return None
+    return normalized
+
+
+def script_for_command(cmd: str) -> str:
+    """Plugin-relative script path of a ${CLAUDE_PLUGIN_ROOT} command, or ""."""
+    if "${CLAUDE_PLUGIN_ROOT}" not in cmd:
+        return ""
+    parts = cmd.replace("${CLAUDE_PLUGIN_ROOT}", "").lstrip("/").split()
+    return parts[0] if parts else ""
+
+
+def _load_hooks(plugin_path: Path) -> list[tuple[str, dict]]:
+    hooks_data = load_json_file(plugin_path / "hooks" / "hooks.json")
+    return normalize_hooks(hooks_data.get("hooks", [])) or []
+
+
+@rule("hooks:manifest",
+      emits=("hooks.no_hooks_json", "hooks.invalid_schema", "hooks.invalid_hooks_field"),
+      inputs=("hooks/hooks.json",))
+def check_manifest(plugin_path: Path, report: Report) -> bool:
+    hooks_json_path = plugin_path / "hooks" / "hooks.json"
+    hooks_data = load_json_file(hooks_json_path)
+
+    if hooks_data is None:
+        if (plugin_path / "hooks").is_dir():
+            report.warn("hooks.no_hooks_json", "hooks/ directory exists but no hooks.json found")
+        return False  # no hooks, nothing to validate
+
+    if not isinstance(hooks_data, dict):
+        report.error("hooks.invalid_schema", "hooks.json must be a JSON object")
+        return False
+
+    if normalize_hooks(hooks_data.get("hooks", [])) is None:
         report.error("hooks.invalid_hooks_field", "hooks.hooks must be an array or object")
-        return
+        return False
+    return True
 
-    for i, (event, hook) in enumerate(normalized):
+
+@rule("hooks:entries",
+      emits=("hooks.unknown_event", "hooks.no_matcher", "hooks.no_plugin_root", "hooks.bad_timeout"),
+      requires=("hooks:manifest",), inputs=("hooks/hooks.json",))
+def check_entries(plugin_path: Path, report: Report) -> None:
+    for i, (event, hook) in enumerate(_load_hooks(plugin_path)):
         prefix = f"hooks[{i}]"
 
         # Event name
@@ -67,7 +95,6 @@ def validate(plugin_path: Path, report: Report) -> None:
         if "matcher" not in hook and "pattern" not in hook:
             report.info("hooks.no_matcher", f"{prefix}: no matcher/pattern — hook matches all")
 
-        # Command/script
         for sub_hook in hook.get("hooks", []):
             cmd = sub_hook.get("command", "")
 
@@ -77,27 +104,6 @@ def validate(plugin_path: Path, report: Report) -> None:
                             f"{prefix}: command path doesn't use ${{CLAUDE_PLUGIN_ROOT}}",
                             command=cmd[:80])
 
-            # Resolve and check script existence
-            if "${CLAUDE_PLUGIN_ROOT}" in cmd:
-                script_rel = cmd.replace("${CLAUDE_PLUGIN_ROOT}", "").lstrip("/").split()[0]
-                script_path = plugin_path / script_rel
-                if not script_path.exists():
-                    report.error("hooks.missing_script",
-                                 f"{prefix}: referenced script not found: {script_rel}",
-                                 script=script_rel)
-                elif not os.access(script_path, os.X_OK):
-                    report.error("hooks.not_executable",
-                                 f"{prefix}: script not executable: {script_rel}",
-                                 script=script_rel)
-                else:
-                    # Check script content for dangerous patterns
-                    content = script_path.read_text(encoding="utf-8", errors="replace")
-                    for pattern, desc in DANGEROUS_PATTERNS:
-                        if pattern.search(content):
-                            report.warn("hooks.dangerous_pattern",
-                                        f"{prefix}: {script_rel} contains {desc}",
-                                        script=script_rel, pattern=desc)
-
             # Timeout
             timeout = sub_hook.get("timeout")
             if timeout is not None:
@@ -106,6 +112,40 @@ def validate(plugin_path: Path, report: Report) -> None:
                                 f"{prefix}: timeout should be 1-600 seconds, got {timeout}")
 
 
+@rule("hooks:scripts",
+      emits=("hooks.missing_script", "hooks.not_executable", "hooks.dangerous_pattern"),
+      requires=("hooks:manifest",), inputs=("hooks/hooks.json",))  # plus the scripts it references
+def check_scripts(plugin_path: Path, report: Report) -> None:
+    for i, (event, hook) in enumerate(_load_hooks(plugin_path)):
+        prefix = f"hooks[{i}]"
+        for sub_hook in hook.get("hooks", []):
+            # Resolve and check script existence
+            script_rel = script_for_command(sub_hook.get("command", ""))
+            if not script_rel:
+                continue
+            script_path = plugin_path / script_rel
+            if not script_path.exists():
+                report.error("hooks.missing_script",
+                             f"{prefix}: referenced script not found: {script_rel}",
+                             script=script_rel)
+            elif not os.access(script_path, os.X_OK):
+                report.error("hooks.not_executable",
+                             f"{prefix}: script not executable: {script_rel}",
+                             script=script_rel)
+            else:
+                # Check script content for dangerous patterns
+                content = script_path.read_text(encoding="utf-8", errors="replace")
+                for pattern, desc in DANGEROUS_PATTERNS:
+                    if pattern.search(content):
+                        report.warn("hooks.dangerous_pattern",
+                                    f"{prefix}: {script_rel} contains {desc}",
+                                    script=script_rel, pattern=desc)
+
+
+def validate(plugin_path: Path, report: Report) -> None:
+    run_rules(plugin_path, report, only=("hooks.*",))
+
+
 if __name__ == "__main__":
     plugin_path = resolve_plugin_path()
     report = Report(str(plugin_path))
@@ -11,35 +11,21 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from common import Report, resolve_plugin_path, load_json_file
+from markdown_index import load_markdown
+from rules import external_rule, rule, run_rules
 
-# Patterns for extracting fenced code blocks and install commands
-FENCE_RE = re.compile(r"^```", re.MULTILINE)
+# Patterns for install commands inside fenced code blocks
 MARKETPLACE_ADD_RE = re.compile(r"claude\s+plugin\s+marketplace\s+add\b")
 PLUGIN_INSTALL_RE = re.compile(r"claude\s+plugin\s+install\s+(\S+)")
 INSTALL_WITH_MARKETPLACE_RE = re.compile(r"claude\s+plugin\s+install\s+(\S+)@(\S+)")
 
 
-def _extract_code_blocks(text: str) -> list[str]:
-    """Extract content of all fenced code blocks from markdown."""
-    blocks: list[str] = []
-    lines = text.split("\n")
-    in_block = False
-    current: list[str] = []
-    for line in lines:
-        if FENCE_RE.match(line.strip()):
-            if in_block:
-                blocks.append("\n".join(current))
-                current = []
-                in_block = False
-            else:
-                in_block = True
-                current = []
-        elif in_block:
-            current.append(line)
-    return blocks
-
-
-def validate(plugin_path: Path, report: Report) -> None:
+@rule("install_docs:readme",
+      emits=("install_docs.no_readme", "install_docs.no_install_block", "install_docs.no_marketplace_add",
+             "install_docs.no_plugin_install", "install_docs.name_mismatch",
+             "install_docs.missing_marketplace_suffix"),
+      inputs=("README.md", ".claude-plugin/plugin.json"))
+def check_readme(plugin_path: Path, report: Report) -> None:
     readme_path = plugin_path / "README.md"
 
     # Check README exists
@@ -47,26 +33,30 @@ def validate(plugin_path: Path, report: Report) -> None:
         report.error("install_docs.no_readme", "README.md missing or empty")
         return
 
-    text = readme_path.read_text(encoding="utf-8")
-    code_blocks = _extract_code_blocks(text)
-    all_code = "\n".join(code_blocks)
+    doc = load_markdown(readme_path)
+    if doc is None:
+        report.error("install_docs.no_readme", "README.md missing or empty")
+        return
 
     # Check for any claude plugin command in code blocks
-    has_claude_plugin = any("claude plugin" in block for block in code_blocks)
-    if not has_claude_plugin:
+    block_line = doc.find("claude plugin", code=True)
+    if block_line is None:
         report.error("install_docs.no_install_block", "No fenced code block containing 'claude plugin'")
         return
 
     # Check for marketplace add
-    has_marketplace_add = bool(MARKETPLACE_ADD_RE.search(all_code))
-    if not has_marketplace_add:
-        report.error("install_docs.no_marketplace_add", "Missing 'claude plugin marketplace add' line in code blocks")
+    if doc.search(MARKETPLACE_ADD_RE, code=True) is None:
+        report.error("install_docs.no_marketplace_add", "Missing 'claude plugin marketplace add' line in code blocks",
+                     file="README.md", line=str(block_line))
 
     # Check for plugin install
-    install_matches = PLUGIN_INSTALL_RE.findall(all_code)
+    install_matches = [(lineno, m.group(1)) for lineno, line in doc.lines_where(code=True)
+                       for m in PLUGIN_INSTALL_RE.finditer(line)]
     if not install_matches:
-        report.error("install_docs.no_plugin_install", "Missing 'claude plugin install' line in code blocks")
+        report.error("install_docs.no_plugin_install", "Missing 'claude plugin install' line in code blocks",
+                     file="README.md", line=str(block_line))
         return
+    first_install = install_matches[0][0]
 
     # Load plugin.json for name verification
     pj_path = plugin_path / ".claude-plugin" / "plugin.json"
@@ -75,51 +65,65 @@ def validate(plugin_path: Path, report: Report) -> None:
 
     # Check name matches plugin.json
     if plugin_name:
-        name_found = False
-        for arg in install_matches:
-            # arg is like "signum@emporium" or "signum"
-            install_name = arg.split("@")[0]
-            if install_name == plugin_name:
-                name_found = True
-                break
-        if not name_found:
+        # arg is like "signum@emporium" or "signum"
+        if not any(arg.split("@")[0] == plugin_name for _, arg in install_matches):
             report.error(
                 "install_docs.name_mismatch",
                 f"Plugin name in install command doesn't match plugin.json name '{plugin_name}'",
-                readme_names=", ".join(install_matches),
+                readme_names=", ".join(arg for _, arg in install_matches),
                 plugin_json=plugin_name,
+                file="README.md",
+                line=str(first_install),
             )
 
     # Check for @marketplace-name suffix
-    has_marketplace_suffix = bool(INSTALL_WITH_MARKETPLACE_RE.search(all_code))
-    if not has_marketplace_suffix:
+    if doc.search(INSTALL_WITH_MARKETPLACE_RE, code=True) is None:
         report.error(
             "install_docs.missing_marketplace_suffix",
             "Install command missing '@marketplace-name' suffix (e.g. 'plugin install name@emporium')",
+            file="README.md",
+            line=str(first_install),
         )
 
-    # CLI validation (optional)
+
+def external_command(plugin_path: Path, report: Report) -> tuple[list[str], Path | None] | None:
+    """argv for `claude plugin validate`, or None (with an INFO) if the CLI is absent."""
     claude_bin = shutil.which("claude")
-    if claude_bin:
-        manifest = pj_path if pj_path.exists() else plugin_path
-        try:
-            result = subprocess.run(
-                [claude_bin, "plugin", "validate", str(manifest)],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-            if result.returncode != 0:
-                stderr = result.stderr.strip()[:200] if result.stderr else ""
-                report.error(
-                    "install_docs.cli_validate_fail",
-                    f"'claude plugin validate' failed (exit {result.returncode})",
-                    stderr=stderr,
-                )
-        except (subprocess.TimeoutExpired, OSError) as exc:
-            report.info("install_docs.cli_validate_skip", f"claude CLI error: {exc}")
-    else:
+    if not claude_bin:
         report.info("install_docs.cli_validate_skip", "claude CLI not in PATH, skipping manifest validation")
+        return None
+    pj_path = plugin_path / ".claude-plugin" / "plugin.json"
+    manifest = pj_path if pj_path.exists() else plugin_path
+    return [claude_bin, "plugin", "validate", str(manifest)], None
+
+
+def apply_external_result(plugin_path: Path, report: Report,
+                          result: subprocess.CompletedProcess | subprocess.TimeoutExpired | OSError) -> None:
+    if isinstance(result, subprocess.TimeoutExpired):
+        report.warn("install_docs.cli_validate_timeout",
+                    f"'claude plugin validate' timed out ({result.timeout:.0f}s)")
+        return
+    if isinstance(result, OSError):
+        report.info("install_docs.cli_validate_skip", f"claude CLI error: {result}")
+        return
+    if result.returncode != 0:
+        stderr = result.stderr.strip()[:200] if result.stderr else ""
+        report.error(
+            "install_docs.cli_validate_fail",
+            f"'claude plugin validate' failed (exit {result.returncode})",
+            stderr=stderr,
+        )
+
+
+external_rule("install_docs:cli",
+              emits=("install_docs.cli_validate_skip", "install_docs.cli_validate_fail",
+                     "install_docs.cli_validate_timeout"),
+              command=external_command, apply=apply_external_result,
+              inputs=(".claude-plugin/plugin.json",))
+
+
+def validate(plugin_path: Path, report: Report) -> None:
+    run_rules(plugin_path, report, only=("install_docs.*",))
 
 
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from common import Report, resolve_plugin_path, load_json_file
+from rules import rule, run_rules
 
 SEMVER_RE = re.compile(r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)$")
 SLUG_RE = re.compile(r"^[a-z][a-z0-9]*(-[a-z0-9]+)*$")
@@ -16,13 +17,29 @@ CHANGELOG_VERSION_RE = re.compile(r"##\s*\[(\d+\.\d+\.\d+)\]")
 REQUIRED_FIELDS = ["name", "version", "description", "author", "license"]
 
 
-def validate(plugin_path: Path, report: Report) -> None:
-    pj_path = plugin_path / ".claude-plugin" / "plugin.json"
-    pj = load_json_file(pj_path)
+def _manifest(plugin_path: Path) -> dict | list | None:
+    return load_json_file(plugin_path / ".claude-plugin" / "plugin.json")
+
 
+@rule("schema:manifest", emits=("schema.no_manifest", "schema.manifest_type"),
+      inputs=(".claude-plugin/plugin.json",))
+def check_manifest(plugin_path: Path, report: Report) -> bool:
+    pj = _manifest(plugin_path)
     if pj is None:
         report.error("schema.no_manifest", "No .claude-plugin/plugin.json found")
-        return
+        return False
+    if not isinstance(pj, dict):
+        report.error("schema.manifest_type", f"plugin.json is not a JSON object: {type(pj).__name__}")
+        return False
+    return True
+
+
+@rule("schema:fields",
+      emits=("schema.missing_field", "schema.invalid_name", "schema.name_mismatch",
+             "schema.invalid_version", "schema.version_type"),
+      requires=("schema:manifest",), inputs=(".claude-plugin/plugin.json",))
+def check_fields(plugin_path: Path, report: Report) -> None:
+    pj = _manifest(plugin_path)
 
     # Required fields
     for field in REQUIRED_FIELDS:
@@ -46,6 +63,13 @@ def validate(plugin_path: Path, report: Report) -> None:
     elif not isinstance(version, str) and version is not None:
         report.error("schema.version_type", f"plugin.json version is not a string: {type(version).__name__}")
 
+
+@rule("schema:changelog",
+      emits=("schema.version_drift", "schema.no_changelog_version", "schema.no_changelog"),
+      requires=("schema:manifest",), inputs=(".claude-plugin/plugin.json", "CHANGELOG.md"))
+def check_changelog(plugin_path: Path, report: Report) -> None:
+    version = _manifest(plugin_path).get("version")
+
     # CHANGELOG version alignment
     changelog_path = plugin_path / "CHANGELOG.md"
     if changelog_path.exists() and isinstance(version, str):
@@ -62,6 +86,10 @@ def validate(plugin_path: Path, report: Report) -> None:
         report.warn("schema.no_changelog", "No CHANGELOG.md found")
 
 
+def validate(plugin_path: Path, report: Report) -> None:
+    run_rules(plugin_path, report, only=("schema.*",))
+
+
 if __name__ == "__main__":
     plugin_path = resolve_plugin_path()
     report = Report(str(plugin_path))
@@ -3,31 +3,43 @@
 
 from __future__ import annotations
 
+import re
 import sys
 from pathlib import Path
 
-import re
-
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from common import Report, resolve_plugin_path, load_json_file
+from markdown_index import load_markdown
+from rules import rule, run_rules
 
 COMPONENT_DIRS = ("commands", "skills", "agents", "hooks")
 ALLOWED_IN_CLAUDE_PLUGIN = {"plugin.json", "marketplace.json"}
+FEEDBACK_HEADING_RE = re.compile(r"(?i)^(?:feedback|обратная связь)")
+REPORTER_RE = re.compile(r"(?i)reporter")
 
 
-def validate(plugin_path: Path, report: Report) -> None:
+@rule("structure:manifest_dir",
+      emits=("structure.no_claude_plugin", "structure.unexpected_manifest_file"),
+      inputs=(".claude-plugin/",))
+def check_manifest_dir(plugin_path: Path, report: Report) -> bool:
     # .claude-plugin/ must exist
     cp_dir = plugin_path / ".claude-plugin"
     if not cp_dir.is_dir():
         report.error("structure.no_claude_plugin", "Missing .claude-plugin/ directory")
-        return
+        return False
 
     # Only allowed files inside .claude-plugin/
     for f in cp_dir.iterdir():
         if f.name not in ALLOWED_IN_CLAUDE_PLUGIN:
             report.warn("structure.unexpected_manifest_file",
                         f"Unexpected file in .claude-plugin/: {f.name}", file=f.name)
+    return True
+
 
+@rule("structure:layout",
+      emits=("structure.no_components", "structure.no_readme", "structure.empty_readme", "structure.no_license"),
+      requires=("structure:manifest_dir",), inputs=(*COMPONENT_DIRS, "README.md", "LICENSE"))
+def check_layout(plugin_path: Path, report: Report) -> None:
     # At least one component directory
     has_component = any((plugin_path / d).is_dir() for d in COMPONENT_DIRS)
     if not has_component:
@@ -45,25 +57,38 @@ def validate(plugin_path: Path, report: Report) -> None:
     if not (plugin_path / "LICENSE").exists():
         report.warn("structure.no_license", "Missing LICENSE file")
 
+
+@rule("structure:feedback", emits=("structure.no_feedback_section",),
+      requires=("structure:manifest_dir",), inputs=("README.md", ".claude-plugin/plugin.json"))
+def check_feedback(plugin_path: Path, report: Report) -> None:
     # Feedback/Reporter section in README (required for heurema plugins)
-    if readme.exists() and readme.stat().st_size >= 50:
-        readme_text = readme.read_text(encoding="utf-8")
-        has_feedback = bool(re.search(r"(?im)^##\s+(?:feedback|обратная связь)", readme_text))
-        has_reporter = "reporter" in readme_text.lower()
+    readme = plugin_path / "README.md"
+    doc = load_markdown(readme) if readme.exists() and readme.stat().st_size >= 50 else None
+    if doc is not None:
+        feedback = doc.section(FEEDBACK_HEADING_RE, level=2)
+        has_reporter = doc.search(REPORTER_RE) is not None
         pj = load_json_file(plugin_path / ".claude-plugin" / "plugin.json")
         is_heurema = False
         if isinstance(pj, dict):
             author = pj.get("author", {})
             if isinstance(author, dict):
                 is_heurema = "heurema" in author.get("name", "").lower()
-        if not has_feedback or not has_reporter:
+        if feedback is None or not has_reporter:
+            # Point at the heading when only the reporter instructions are missing
+            sources = {"file": "README.md", "line": str(feedback.line)} if feedback else {"file": "README.md"}
             if is_heurema:
                 report.error("structure.no_feedback_section",
-                             "README.md missing Feedback section with reporter install instructions")
+                             "README.md missing Feedback section with reporter install instructions", **sources)
             else:
                 report.warn("structure.no_feedback_section",
-                            "README.md missing Feedback section (recommended)")
+                            "README.md missing Feedback section (recommended)", **sources)
+
 
+@rule("structure:components",
+      emits=("structure.command_not_md", "structure.skill_no_entrypoint",
+             "structure.agent_not_md", "structure.agent_no_frontmatter"),
+      requires=("structure:manifest_dir",), inputs=("commands/*", "skills/*/", "agents/*"))
+def check_components(plugin_path: Path, report: Report) -> None:
     # Commands must be .md
     cmd_dir = plugin_path / "commands"
     if cmd_dir.is_dir():
@@ -94,6 +119,10 @@ def validate(plugin_path: Path, report: Report) -> None:
                                 f"Agent {f.name} missing YAML frontmatter", file=f.name)
 
 
+def validate(plugin_path: Path, report: Report) -> None:
+    run_rules(plugin_path, report, only=("structure.*",))
+
+
 if __name__ == "__main__":
     plugin_path = resolve_plugin_path()
     report = Report(str(plugin_path))